@@ -12,18 +12,40 @@ import functools
 import signal
 import sys
 import argparse
+import json
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 from DrissionPage import ChromiumPage, ChromiumOptions
 
 # 随机评论文本
 RANDOM_COMMENTS = ["bdbdbdbd", "绑定", "帮顶", "bd", "帮帮bd"]
 
+# 同时评论的最大标签页数量，以及首批标签页之间错开启动的秒数
+MAX_COMMENT_WORKERS = 3
+COMMENT_STAGGER_SECONDS = 2
+
+# 浏览器用户数据目录和调试端口，跨次运行复用会话缓存，常驻模式下复用同一浏览器
+CHROME_PROFILE_DIR = os.environ.get("NS_PROFILE_DIR", "./.chrome-profile")
+CHROME_DEBUG_PORT = int(os.environ.get("NS_DEBUG_PORT", "9222"))
+
+# 发表评论的接口路径，用于监听提交结果
+COMMENT_API = "/api/content/new-comment"
+
+# 脚本无需读取的媒体资源，在传输层直接屏蔽；图片由浏览器选项统一禁用，
+# 字体不屏蔽，避免图标字体缺失导致签到、加鸡腿等图标按钮尺寸为0
+BLOCKED_URLS = [
+    "*.mp4",
+]
+
 # 配置loguru日志
 logger.remove()  # 移除默认处理器
+# 控制台直接写stderr，时间戳由文件日志记录
 logger.add(
-    sink=lambda msg: print(msg),
+    sys.stderr,
     level="INFO",
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <level>{message}</level>",
+    format="<level>{level}</level> | <level>{message}</level>",
+    colorize=True,
 )
 logger.add(
     sink="nodeseek.log",
@@ -34,13 +56,33 @@ logger.add(
 )
 
 
-def retry(max_retries=3, delay=1):
+def is_target_title(title):
+    """只要特定内容的帖子：标题包含出但不是已出"""
+    return "出" in title and "已出" not in title
+
+
+# retry未设置default时的占位值，表示重试耗尽后抛出异常
+_RAISE = object()
+
+
+def retry(
+    max_retries=3,
+    delay=1,
+    backoff=2.0,
+    exceptions=(Exception,),
+    skip_exceptions=(ValueError,),
+    default=_RAISE,
+):
     """
     重试装饰器，用于自动重试可能失败的操作
 
     Args:
         max_retries: 最大重试次数
-        delay: 重试间隔秒数
+        delay: 首次重试间隔秒数，之后按backoff指数增长并附加随机抖动
+        backoff: 重试间隔的增长系数
+        exceptions: 需要重试的异常类型
+        skip_exceptions: 不重试直接抛出的异常类型（如配置错误）
+        default: 达到最大重试次数后的返回值，未设置时抛出最后一次的异常
     """
 
     def decorator(func):
@@ -50,7 +92,9 @@ def retry(max_retries=3, delay=1):
             while retries < max_retries:
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except skip_exceptions:
+                    raise
+                except exceptions as e:
                     retries += 1
                     logger.warning(
                         f"函数 {func.__name__} 执行失败 ({retries}/{max_retries}): {str(e)}"
@@ -59,8 +103,14 @@ def retry(max_retries=3, delay=1):
                         logger.error(
                             f"函数 {func.__name__} 已达到最大重试次数 {max_retries}，停止重试"
                         )
-                        raise
-                    time.sleep(delay)
+                        if default is _RAISE:
+                            raise
+                        return default
+                    wait_time = delay * (backoff ** (retries - 1)) + random.uniform(
+                        0, 0.3
+                    )
+                    logger.debug(f"函数 {func.__name__} 将在 {wait_time:.2f} 秒后重试")
+                    time.sleep(wait_time)
 
         return wrapper
 
@@ -94,17 +144,22 @@ class NodeSeekDaily:
 
     def login(self):
         """
-        登录方法：优先cookie，失败自动账号密码
+        登录方法：已有会话直接复用，否则优先cookie，失败自动账号密码
         """
-        # 先尝试cookie登录
+        self.page.get("https://www.nodeseek.com")
+
+        # 持久化的浏览器配置中已有有效会话时直接返回，用户卡片可能晚于DOMContentLoaded渲染
+        if self._is_logged_in(timeout=3):
+            logger.info("已处于登录状态，跳过cookie登录")
+            return True
+
+        # 再尝试cookie登录
         if self.cookie:
             logger.info("尝试使用cookie登录...")
-            self.page.get("https://www.nodeseek.com")
-            time.sleep(2)
             self.page.set.cookies(self.cookie)
             self.page.refresh()
-            time.sleep(2)
-            if self._is_logged_in():
+            # 用户卡片在DOMContentLoaded之后才渲染，需有限等待
+            if self._is_logged_in(timeout=3):
                 logger.info("Cookie验证成功，已登录")
                 return True
             else:
@@ -112,17 +167,31 @@ class NodeSeekDaily:
         logger.error("未配置有效的cookie或账号密码，无法登录")
         return False
 
-    def _is_logged_in(self):
-        """检测是否已登录"""
+    def _is_logged_in(self, timeout=0):
+        """
+        检测是否已登录
+
+        Args:
+            timeout: 等待用户卡片出现的最长秒数，为0时立即返回
+        """
         try:
-            user_card = self.page.ele(
-                "css:#nsk-right-panel-container > div.user-card", timeout=3
+            if timeout:
+                return bool(
+                    self.page.wait.ele_displayed(
+                        "css:#nsk-right-panel-container > div.user-card",
+                        timeout=timeout,
+                    )
+                )
+            # 直接在页面内查询，元素不存在时立即返回而不轮询等待
+            return bool(
+                self.page.run_js(
+                    "return !!document.querySelector('#nsk-right-panel-container > div.user-card');"
+                )
             )
-            return bool(user_card)
         except Exception:
             return False
 
-    @retry(max_retries=3, delay=2)
+    @retry(max_retries=3, delay=2, default=False)
     def setup_browser(self):
         """
         初始化并配置浏览器（不做登录）
@@ -132,6 +201,13 @@ class NodeSeekDaily:
             options = ChromiumOptions()
             user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             options.set_user_agent(user_agent)
+            # 固定用户数据目录和端口，端口上已有浏览器时直接接管而不是重新启动
+            options.set_user_data_path(CHROME_PROFILE_DIR)
+            options.set_local_port(CHROME_DEBUG_PORT)
+            # 禁止加载图片，减小页面体积
+            options.no_imgs(True)
+            # DOMContentLoaded即返回，无需等待全部子资源加载
+            options.set_load_mode("eager")
             if self.headless:
                 logger.info("启用无头模式...")
                 options.headless = True
@@ -140,6 +216,7 @@ class NodeSeekDaily:
                 options.set_argument("--disable-gpu")
             logger.info("正在启动Chrome...")
             self.page = ChromiumPage(addr_or_opts=options)
+            self.page.set.blocked_urls(BLOCKED_URLS)
             if self.headless:
                 self.page.run_js(
                     'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
@@ -148,6 +225,13 @@ class NodeSeekDaily:
             return True
         except Exception as e:
             logger.exception(f"设置浏览器时出错: {str(e)}")
+            raise
+
+    def is_browser_alive(self):
+        """检测浏览器页面是否仍可用"""
+        try:
+            return bool(self.page and self.page.states.is_alive)
+        except Exception:
             return False
 
     def __del__(self):
@@ -159,7 +243,7 @@ class NodeSeekDaily:
         except Exception as e:
             logger.warning(f"关闭浏览器时出错: {str(e)}")
 
-    @retry(max_retries=3, delay=2)
+    @retry(max_retries=3, delay=2, default=False)
     def sign_in(self):
         """
         执行签到功能，点击签到图标并选择奖励
@@ -167,16 +251,18 @@ class NodeSeekDaily:
         Returns:
             bool: 签到是否成功
         """
+        # 签到图标一旦点击就不能交给retry重新执行，避免重复签到或重复领取奖励
+        icon_clicked = False
         try:
             logger.info("开始执行签到操作...")
 
             # 确保在主页
             self.page.get("https://www.nodeseek.com")
-            time.sleep(3)  # 等待页面加载完成
 
-            # 查找签到图标
+            # 等待签到图标出现，替代固定等待
             logger.info("开始查找签到图标...")
-            sign_icon = self.page.ele("xpath://span[@title='签到']", timeout=10)
+            self.page.wait.ele_displayed("css:span[title='签到']", timeout=10)
+            sign_icon = self.page.ele("css:span[title='签到']", timeout=1)
 
             if not sign_icon:
                 logger.warning("未找到签到图标，可能已经签到过了")
@@ -185,6 +271,7 @@ class NodeSeekDaily:
             logger.info("找到签到图标，准备点击...")
 
             # 点击签到图标
+            icon_clicked = True
             try:
                 sign_icon.click()
                 logger.info("签到图标点击成功")
@@ -193,8 +280,8 @@ class NodeSeekDaily:
                 self.page.run_js("arguments[0].click();", sign_icon.inner_ele)
                 logger.info("JavaScript点击签到图标成功")
 
-            # 等待页面跳转和加载
-            time.sleep(3)  # 等待页面加载完成
+            # 等待页面跳转和加载完成
+            self.page.wait.doc_loaded(timeout=10)
 
             # 打印当前URL
             logger.debug(f"当前页面URL: {self.page.url}")
@@ -208,19 +295,25 @@ class NodeSeekDaily:
                         "xpath://button[contains(text(), '试试手气')]", timeout=5
                     )
                     if lucky_btn:
+                        # 点击前记下按钮所在的确认框，按钮本身点击后可能仍留在页面中
+                        reward_box = lucky_btn.parent()
                         lucky_btn.click()
                         logger.info("'试试手气'按钮点击成功")
+                        # 等待确认框消失
+                        reward_box.wait.deleted(timeout=3)
                 else:
                     logger.info("尝试点击'鸡腿 x 5'按钮...")
                     chicken_btn = self.page.ele(
                         "xpath://button[contains(text(), '鸡腿 x 5')]", timeout=5
                     )
                     if chicken_btn:
+                        # 点击前记下按钮所在的确认框，按钮本身点击后可能仍留在页面中
+                        reward_box = chicken_btn.parent()
                         chicken_btn.click()
                         logger.info("'鸡腿 x 5'按钮点击成功")
+                        # 等待确认框消失
+                        reward_box.wait.deleted(timeout=3)
 
-                # 等待确认框消失
-                time.sleep(2)
                 logger.info("签到完成")
                 return True
 
@@ -237,9 +330,11 @@ class NodeSeekDaily:
                 logger.debug(f"页面源码片段: {self.page.html[:500]}...")
             except:
                 pass
-            return False
+            if icon_clicked:
+                return False
+            raise
 
-    @retry(max_retries=3, delay=2)
+    @retry(max_retries=3, delay=2, default=0)
     def comment_posts(self, max_posts=5):
         """
         执行随机评论功能，访问交易区并随机评论帖子
@@ -257,182 +352,211 @@ class NodeSeekDaily:
             target_url = "https://www.nodeseek.com/categories/trade"
             logger.info(f"正在访问交易区: {target_url}")
             self.page.get(target_url)
-            time.sleep(3)  # 等待页面加载完成
+            # 等待帖子列表出现，替代固定等待
+            self.page.wait.ele_displayed("css:.post-list-item", timeout=10)
             logger.info("交易区页面加载完成")
 
-            # 获取帖子列表
+            # 获取帖子列表，在页面内一次性取出置顶标记、标题和链接
             logger.info("获取帖子列表...")
-            post_items = self.page.eles("css:.post-list-item", timeout=10)
+            post_items = self.page.run_js("""
+            return Array.from(document.querySelectorAll('.post-list-item')).map(p => {
+                const t = p.querySelector('.post-title');
+                const a = t && t.querySelector('a');
+                return {
+                    pinned: !!p.querySelector('.pined'),
+                    title: t ? t.innerText : '',
+                    href: a ? a.getAttribute('href') : null,
+                };
+            });
+            """) or []
             logger.info(f"成功获取到 {len(post_items)} 个帖子")
 
             if not post_items:
                 logger.warning("未找到可评论的帖子")
                 return 0
 
-            # 过滤掉置顶帖
-            filtered_posts = []
-            for post in post_items:
-                # 检查帖子是否是置顶帖
-                if not post.ele("css:.pined", timeout=0.5):
-                    filtered_posts.append(post)
-
-            logger.info(f"过滤后有 {len(filtered_posts)} 个非置顶帖")
-
-            valid_posts = []
-            # 只要特定内容的帖子 标题包含出 但不是已出
-            for post in filtered_posts:
-                if (
-                    "出" in post.ele("css:.post-title").text
-                    and "已出" not in post.ele("css:.post-title").text
-                ):
-                    valid_posts.append(post)
+            # 单次遍历过滤掉置顶帖和不符合标题条件的帖子，按链接去重
+            valid_urls = list(
+                dict.fromkeys(
+                    post["href"]
+                    for post in post_items
+                    if not post["pinned"]
+                    and post["href"]
+                    and is_target_title(post["title"])
+                )
+            )
 
-            logger.info(f"符合条件的帖子有 {len(valid_posts)} 个")
+            logger.info(f"符合条件的帖子有 {len(valid_urls)} 个")
 
-            if not valid_posts:
+            if not valid_urls:
                 logger.warning("没有找到非置顶帖")
                 return 0
 
             # 随机选择帖子，但不超过max_posts或可用数量
-            post_count = min(max_posts, len(valid_posts))
-            selected_posts = random.sample(valid_posts, post_count)
-
-            # 收集帖子URL
-            selected_urls = []
-            for post in selected_posts:
-                try:
-                    post_link = post.ele("css:.post-title a")
-                    if post_link:
-                        selected_urls.append(post_link.attr("href"))
-                except Exception as e:
-                    logger.warning(f"获取帖子链接失败: {str(e)}")
-                    continue
+            post_count = min(max_posts, len(valid_urls))
+            selected_urls = random.sample(valid_urls, post_count)
 
             logger.info(f"已选择 {len(selected_urls)} 个帖子进行评论")
 
-            # 记录是否已加鸡腿
-            chicken_added = False
-            comment_count = 0
+            # 补全帖子URL
+            full_urls = [
+                url if url.startswith("http") else f"https://www.nodeseek.com{url}"
+                for url in selected_urls
+            ]
+
+            # 每个帖子在独立标签页中并发评论，限制并发数避免触发频率限制；
+            # 首批标签页错开启动，避免同一时刻集中提交
+            workers = min(MAX_COMMENT_WORKERS, len(full_urls))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = []
+                for i, full_url in enumerate(full_urls):
+                    if 0 < i < workers:
+                        time.sleep(COMMENT_STAGGER_SECONDS)
+                    futures.append(executor.submit(self._comment_post, full_url))
+                comment_count = sum(future.result() for future in futures)
 
-            # 遍历选中的帖子URL并评论
-            for i, post_url in enumerate(selected_urls):
-                try:
-                    logger.info(f"正在处理第 {i + 1}/{len(selected_urls)} 个帖子")
+            logger.info(f"评论任务完成，共成功评论 {comment_count} 个帖子")
+            return comment_count
 
-                    # 访问帖子页面
-                    if not post_url.startswith("http"):
-                        full_url = f"https://www.nodeseek.com{post_url}"
-                    else:
-                        full_url = post_url
+        except Exception as e:
+            logger.exception(f"评论操作执行出错: {str(e)}")
+            raise
 
-                    logger.info(f"访问帖子: {full_url}")
-                    self.page.get(full_url)
-                    time.sleep(3)  # 等待页面加载完成
-
-                    # 如果还没有加过鸡腿，尝试加鸡腿
-                    # if not chicken_added:
-                    #     chicken_added = self.add_chicken_leg()
-
-                    # 查找评论编辑器
-                    logger.info("查找评论编辑器...")
-                    editor = self.page.ele("css:.CodeMirror", timeout=10)
-
-                    if not editor:
-                        logger.warning("未找到评论编辑器，跳过此帖子")
-                        continue
-
-                    # 点击编辑器获取焦点
-                    logger.info("点击编辑器获取焦点...")
-                    editor.click()
-                    time.sleep(0.5)
-
-                    # 随机选择评论文本
-                    input_text = random.choice(RANDOM_COMMENTS)
-                    logger.info(f"准备输入评论内容: {input_text}")
-
-                    # 清空编辑器并输入评论
-                    self.page.run_js("""
-                    var editor = document.querySelector(".CodeMirror").CodeMirror;
-                    editor.setValue("");
-                    editor.refresh();
-                    """)
-                    time.sleep(0.5)
-
-                    # 模拟真实用户输入，每个字符之间有随机延迟
-                    for char in input_text:
-                        # 使用JavaScript注入字符
-                        self.page.run_js(f'''
-                        var editor = document.querySelector(".CodeMirror").CodeMirror;
-                        editor.replaceSelection("{char}");
-                        ''')
-                        # 随机延迟模拟真实输入
-                        time.sleep(random.uniform(0.1, 0.3))
-
-                    # 等待确保内容已输入
-                    time.sleep(1)
-
-                    # 查找并点击发布评论按钮
-                    logger.info("寻找发布评论按钮...")
-                    submit_btn = self.page.ele(
-                        "xpath://button[contains(@class, 'submit') and contains(@class, 'btn') and contains(text(), '发布评论')]",
-                        timeout=5,
-                    )
+    def _comment_post(self, full_url):
+        """
+        在新标签页中打开帖子并发表评论，完成后关闭标签页
 
-                    if not submit_btn:
-                        logger.warning("未找到发布评论按钮，跳过此帖子")
-                        continue
+        Args:
+            full_url: 帖子完整URL
 
-                    # 点击发布按钮
-                    submit_btn.click()
-                    logger.info(f"已在帖子 {full_url} 中提交评论")
+        Returns:
+            bool: 评论是否提交成功
+        """
+        tab = None
+        try:
+            logger.info(f"访问帖子: {full_url}")
+            # 先屏蔽静态资源再访问，屏蔽规则按标签页生效
+            tab = self.page.new_tab()
+            tab.set.blocked_urls(BLOCKED_URLS)
+            tab.get(full_url)
+            # 等待评论编辑器出现，替代固定等待
+            tab.wait.ele_displayed("css:.CodeMirror", timeout=10)
+
+            # 如需加鸡腿，帖子已在当前标签页打开，无需重新访问
+            # self.add_chicken_leg(page=tab)
+
+            # 查找评论编辑器
+            logger.info("查找评论编辑器...")
+            editor = tab.ele("css:.CodeMirror", timeout=1)
+
+            if not editor:
+                logger.warning(f"未找到评论编辑器，跳过帖子 {full_url}")
+                return False
 
-                    # 随机等待一段时间再处理下一个帖子
-                    wait_time = random.uniform(2, 5)
-                    logger.info(f"等待 {wait_time:.1f} 秒后继续...")
-                    time.sleep(wait_time)
+            # 点击编辑器获取焦点
+            logger.info("点击编辑器获取焦点...")
+            editor.click()
+            time.sleep(0.5)
 
-                    comment_count += 1
+            # 随机选择评论文本
+            input_text = random.choice(RANDOM_COMMENTS)
+            logger.info(f"准备输入评论内容: {input_text}")
 
-                except Exception as e:
-                    logger.warning(f"评论帖子时出错: {str(e)}")
-                    continue
+            # 通过CodeMirror API一次性写入评论，服务端不感知逐字输入
+            tab.run_js(f"""
+            var editor = document.querySelector(".CodeMirror").CodeMirror;
+            editor.setValue({json.dumps(input_text)});
+            editor.refresh();
+            """)
 
-            logger.info(f"评论任务完成，共成功评论 {comment_count} 个帖子")
-            return comment_count
+            # 查找并点击发布评论按钮
+            logger.info("寻找发布评论按钮...")
+            submit_btn = tab.ele("css:button.submit.btn", timeout=3)
+
+            if not submit_btn:
+                logger.warning(f"未找到发布评论按钮，跳过帖子 {full_url}")
+                return False
+
+            # 点击发布按钮，并监听评论接口的响应作为完成信号
+            tab.listen.start(COMMENT_API)
+            submit_btn.click()
+            logger.info(f"已在帖子 {full_url} 中提交评论")
+
+            packet = tab.listen.wait(timeout=5)
+            tab.listen.stop()
+            if not packet:
+                # 接口路径尚未在线上确认，未捕获到响应时按已提交处理，不计为失败
+                logger.warning(
+                    f"未捕获到评论接口 {COMMENT_API} 的响应，帖子 {full_url} 已提交但结果未确认"
+                )
+                return True
+            if packet.response.status != 200:
+                logger.warning(
+                    f"帖子 {full_url} 评论接口返回状态码 {packet.response.status}"
+                )
+                return False
+
+            # 频率限制等拒绝原因在响应体中返回，需检查success标记
+            body = packet.response.body
+            if isinstance(body, str):
+                try:
+                    body = json.loads(body)
+                except ValueError:
+                    body = {}
+            if not isinstance(body, dict) or not body.get("success"):
+                message = body.get("message") if isinstance(body, dict) else body
+                logger.warning(f"帖子 {full_url} 评论被拒绝: {message}")
+                return False
+
+            logger.info(f"帖子 {full_url} 评论成功")
+            return True
 
         except Exception as e:
-            logger.exception(f"评论操作执行出错: {str(e)}")
-            return 0
+            logger.warning(f"评论帖子 {full_url} 时出错: {str(e)}")
+            return False
+        finally:
+            if tab:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
 
-    @retry(max_retries=2, delay=1)
-    def add_chicken_leg(self, post_url=None):
+    @retry(max_retries=2, delay=1, default=False)
+    def add_chicken_leg(self, post_url=None, force_reload=False, page=None):
         """
         给帖子加鸡腿
 
         Args:
             post_url: 帖子URL，如果为None则使用当前页面
+            force_reload: 当前页面已是该帖子时是否仍重新访问
+            page: 操作的页面或标签页，默认为主页面
 
         Returns:
             bool: 加鸡腿是否成功
         """
+        # 确认按钮一旦点击就不能交给retry重新执行，避免重复消耗鸡腿
+        confirmed = False
         try:
             logger.info("开始执行加鸡腿操作...")
 
-            # 如果提供了URL，先访问该页面
+            page = page or self.page
+
+            # 如果提供了URL且当前不在该页面，先访问该页面
             if post_url:
                 if not post_url.startswith("http"):
                     full_url = f"https://www.nodeseek.com{post_url}"
                 else:
                     full_url = post_url
 
-                logger.info(f"访问帖子: {full_url}")
-                self.page.get(full_url)
-                time.sleep(3)  # 等待页面加载完成
+                if force_reload or page.url != full_url:
+                    logger.info(f"访问帖子: {full_url}")
+                    page.get(full_url)
+                    page.wait.doc_loaded(timeout=10)
 
             # 查找加鸡腿按钮
             logger.info("查找加鸡腿按钮...")
-            chicken_btn = self.page.ele(
-                "xpath://div[@class='nsk-post']//div[@title='加鸡腿'][1]", timeout=5
+            chicken_btn = page.ele(
+                "css:div.nsk-post div[title='加鸡腿']", timeout=5
             )
 
             if not chicken_btn:
@@ -441,7 +565,7 @@ class NodeSeekDaily:
 
             # 确保按钮可见
             logger.info("准备点击加鸡腿按钮...")
-            self.page.run_js(
+            page.run_js(
                 "arguments[0].scrollIntoView({block: 'center'});", chicken_btn.inner_ele
             )
             time.sleep(0.5)
@@ -452,21 +576,21 @@ class NodeSeekDaily:
 
             # 等待确认对话框出现
             logger.info("等待确认对话框...")
-            confirm_dialog = self.page.ele("css:.msc-confirm", timeout=5)
+            confirm_dialog = page.ele("css:.msc-confirm", timeout=5)
 
             if not confirm_dialog:
                 logger.warning("未出现确认对话框")
                 return False
 
-            # 检查是否是7天前的帖子
+            # 检查是否是7天前的帖子，对话框已出现，直接判断是否存在无需等待
             try:
-                error_title = self.page.ele(
-                    "xpath://h3[contains(text(), '该评论创建于7天前')]", timeout=1
+                error_title = confirm_dialog.ele(
+                    "xpath:.//h3[contains(text(), '该评论创建于7天前')]", timeout=0
                 )
                 if error_title:
                     logger.info("该帖子超过7天，无法加鸡腿")
                     # 点击确认按钮关闭对话框
-                    ok_btn = self.page.ele("css:.msc-confirm .msc-ok")
+                    ok_btn = page.ele("css:.msc-confirm .msc-ok")
                     if ok_btn:
                         ok_btn.click()
                         logger.info("已关闭对话框")
@@ -477,8 +601,9 @@ class NodeSeekDaily:
 
             # 点击确认按钮
             logger.info("点击确认按钮...")
-            ok_btn = self.page.ele("css:.msc-confirm .msc-ok", timeout=3)
+            ok_btn = page.ele("css:.msc-confirm .msc-ok", timeout=3)
             if ok_btn:
+                confirmed = True
                 ok_btn.click()
                 logger.info("确认加鸡腿成功")
             else:
@@ -487,14 +612,17 @@ class NodeSeekDaily:
 
             # 等待确认对话框消失
             logger.info("等待对话框消失...")
-            time.sleep(3)  # 等待对话框消失
+            confirm_dialog.wait.deleted(timeout=5)
 
             logger.info("加鸡腿操作完成")
             return True
 
         except Exception as e:
+            if confirmed:
+                logger.warning(f"已确认加鸡腿，后续步骤出错: {str(e)}")
+                return True
             logger.warning(f"加鸡腿操作失败: {str(e)}")
-            return False
+            raise
 
     def run_all(self, max_posts=5):
         """
@@ -507,8 +635,8 @@ class NodeSeekDaily:
             bool: 所有任务是否成功完成
         """
         try:
-            # 初始化浏览器
-            if not self.setup_browser():
+            # 初始化浏览器，已初始化时复用现有页面
+            if not self.page and not self.setup_browser():
                 logger.error("浏览器初始化失败，程序退出")
                 return False
 
@@ -543,6 +671,23 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
+def parse_run_at(value):
+    """
+    校验并规范化--run-at参数
+
+    Args:
+        value: 命令行传入的时间字符串
+
+    Returns:
+        str: 规范化后的HH:MM时间
+    """
+    try:
+        moment = datetime.strptime(value, "%H:%M")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的时间 {value!r}，格式应为HH:MM")
+    return moment.strftime("%H:%M")
+
+
 def parse_args():
     """
     解析命令行参数
@@ -568,10 +713,77 @@ def parse_args():
         help='签到时使用"试试手气"选项（覆盖环境变量设置）',
     )
     parser.add_argument("--max-posts", type=int, default=5, help="最大评论帖子数量")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常驻运行，启动后立即执行一次，之后复用同一浏览器每天定时执行任务",
+    )
+    parser.add_argument(
+        "--run-at",
+        type=parse_run_at,
+        default="00:05",
+        help="常驻模式下每天执行任务的时间，格式HH:MM（默认00:05）",
+    )
 
     return parser.parse_args()
 
 
+def seconds_until(run_at):
+    """
+    计算距离下一次指定时刻的秒数
+
+    Args:
+        run_at: 每天执行的时间，格式HH:MM
+
+    Returns:
+        float: 距离下一次执行的秒数
+    """
+    hour, minute = (int(part) for part in run_at.split(":"))
+    now = datetime.now()
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def run_tasks(node_seek, args):
+    """
+    登录并根据命令行参数执行指定任务
+
+    Args:
+        node_seek: 已初始化浏览器的NodeSeekDaily实例
+        args: 解析后的命令行参数
+
+    Returns:
+        bool: 任务是否执行完成
+    """
+    # 登录
+    if not node_seek.login():
+        logger.error("登录失败，程序退出")
+        return False
+
+    # 根据命令行参数执行指定任务
+    if args.sign_only:
+        logger.info("仅执行签到任务")
+        sign_result = node_seek.sign_in()
+        if sign_result:
+            logger.info("签到流程执行成功")
+        else:
+            logger.warning("签到流程执行失败或已签到")
+    elif args.comment_only:
+        logger.info("仅执行评论任务")
+        comment_count = node_seek.comment_posts(max_posts=args.max_posts)
+        logger.info(f"共成功评论 {comment_count} 个帖子")
+    else:
+        # 执行所有任务
+        logger.info("执行所有任务")
+        if not node_seek.run_all(max_posts=args.max_posts):
+            return False
+
+    logger.info("NodeSeek任务执行完成")
+    return True
+
+
 def main():
     """主函数"""
     try:
@@ -599,31 +811,24 @@ def main():
             logger.error("浏览器初始化失败，程序退出")
             return False
 
-        # 登录
-        if not node_seek.login():
-            logger.error("登录失败，程序退出")
-            return False
-
-        # 根据命令行参数执行指定任务
-        if args.sign_only:
-            logger.info("仅执行签到任务")
-            sign_result = node_seek.sign_in()
-            if sign_result:
-                logger.info("签到流程执行成功")
-            else:
-                logger.warning("签到流程执行失败或已签到")
-        elif args.comment_only:
-            logger.info("仅执行评论任务")
-            comment_count = node_seek.comment_posts(max_posts=args.max_posts)
-            logger.info(f"共成功评论 {comment_count} 个帖子")
-        else:
-            # 执行所有任务
-            logger.info("执行所有任务")
-            if not node_seek.run_all(max_posts=args.max_posts):
-                return False
+        if not args.daemon:
+            return run_tasks(node_seek, args)
 
-        logger.info("NodeSeek任务执行完成")
-        return True
+        # 常驻模式：保持浏览器实例，启动时先执行一次，之后按计划重复执行任务
+        logger.info(f"进入常驻模式，立即执行一次，之后每天 {args.run_at} 执行任务")
+        while True:
+            try:
+                # 浏览器已断开时重新初始化，再执行本次任务
+                if not node_seek.is_browser_alive():
+                    logger.warning("浏览器连接已断开，重新初始化浏览器...")
+                    if not node_seek.setup_browser():
+                        raise RuntimeError("浏览器重新初始化失败")
+                run_tasks(node_seek, args)
+            except Exception as e:
+                logger.exception(f"本次任务执行出错，等待下次执行: {str(e)}")
+            wait_seconds = seconds_until(args.run_at)
+            logger.info(f"下次执行将在 {wait_seconds / 3600:.1f} 小时后")
+            time.sleep(wait_seconds)
     except Exception as e:
         logger.exception(f"程序执行出错: {str(e)}")
         return False